@@ -7,61 +7,166 @@ Build and installation scripts
 """
 Build script for creating executables
 """
+import importlib.util
+import os
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 
 
-def build_executable():
-    """Build standalone executable using PyInstaller"""
+# Spec template used by _write_pyinstaller_spec. PyInstaller injects
+# Analysis/PYZ/EXE into the spec's execution namespace, so no imports.
+_SPEC_TMPL = """# Auto-generated by scripts.build_executable for PySide6 {pyside_version}.
+# Regenerated automatically when the PySide6 version changes - do not edit.
+a = Analysis(
+    [{main_py!r}],
+    pathex=[{src_path!r}],
+    binaries={binaries!r},
+    datas=[({src_path!r}, "src")],
+    hiddenimports=["PySide6.QtCore", "PySide6.QtGui", "PySide6.QtWidgets", "pynput"],
+)
+pyz = PYZ(a.pure)
+exe = EXE(
+    pyz,
+    a.scripts,
+    a.binaries,
+    a.datas,
+    name="B1Clip",
+    console=False,
+    icon={icon!r},
+)
+"""
+
+
+def _write_pyinstaller_spec(project_root, cache_dir):
+    """Generate B1Clip.spec with PySide6 binaries pre-enumerated.
+
+    Listing the Qt shared libraries in Analysis(binaries=...) lets
+    PyInstaller skip the recursive binary-dependency walk of PySide6's
+    plugin tree - the largest chunk of a Qt bundle's analysis phase. The
+    spec is cached and only regenerated when PySide6 itself changes.
+    """
+    spec_path = project_root / "B1Clip.spec"
+    stamp = cache_dir / "pyside6.version"
 
-    # Check if PyInstaller is installed
     try:
-        import PyInstaller
+        import PySide6
+
+        pyside_version = PySide6.__version__
+        pyside_dir = Path(PySide6.__file__).parent
     except ImportError:
+        return None
+
+    if (
+        spec_path.exists()
+        and stamp.exists()
+        and stamp.read_text(encoding="utf-8") == pyside_version
+    ):
+        return spec_path
+
+    binaries = []
+    for pattern in ("*.so*", "*.dll", "*.pyd"):
+        binaries.extend(
+            (str(lib), "PySide6") for lib in sorted(pyside_dir.glob(pattern))
+        )
+
+    src_path = project_root / "src"
+    icon = project_root / "resources" / "icons" / "app.ico"
+    spec_path.write_text(
+        _SPEC_TMPL.format(
+            pyside_version=pyside_version,
+            main_py=str(src_path / "main.py"),
+            src_path=str(src_path),
+            binaries=binaries,
+            icon=str(icon) if icon.exists() else None,
+        ),
+        encoding="utf-8",
+    )
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    stamp.write_text(pyside_version, encoding="utf-8")
+    return spec_path
+
+
+def build_executable():
+    """Build standalone executable using PyInstaller"""
+
+    # Check availability without importing PyInstaller (its top-level
+    # import triggers plugin discovery; find_spec has no side effects)
+    if importlib.util.find_spec("PyInstaller") is None:
         print("Installing PyInstaller...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--disable-pip-version-check",
+                "--no-input",
+                "pyinstaller",
+            ]
+        )
 
     # Get project root
     project_root = Path(__file__).parent.parent
     src_path = project_root / "src"
     main_py = src_path / "main.py"
 
-    # Build command
-    cmd = [
-        "pyinstaller",
-        "--onefile",
-        "--windowed",
-        "--name",
-        "B1Clip",
-        "--icon",
-        (
-            str(project_root / "resources" / "icons" / "app.ico")
-            if (project_root / "resources" / "icons" / "app.ico").exists()
-            else None
-        ),
-        "--add-data",
-        f"{src_path};src",
-        "--hidden-import",
-        "PySide6.QtCore",
-        "--hidden-import",
-        "PySide6.QtGui",
-        "--hidden-import",
-        "PySide6.QtWidgets",
-        "--hidden-import",
-        "pynput",
-        str(main_py),
+    # Persistent work directory so PyInstaller can reuse its dependency
+    # analysis and stripped-binary cache between runs (no --clean).
+    cache_dir = project_root / ".pyinstaller-cache"
+
+    # Prefer a cached spec file with PySide6 binaries pre-enumerated;
+    # fall back to the flag-driven invocation when PySide6 is missing.
+    spec_path = _write_pyinstaller_spec(project_root, cache_dir)
+
+    common = [
+        "--noconfirm",
+        "--workpath",
+        str(cache_dir / "build"),
+        "--distpath",
+        str(project_root / "dist"),
     ]
+    if spec_path is not None:
+        cmd = ["pyinstaller", *common, str(spec_path)]
+    else:
+        cmd = [
+            "pyinstaller",
+            "--onefile",
+            "--windowed",
+            *common,
+            "--name",
+            "B1Clip",
+            "--icon",
+            (
+                str(project_root / "resources" / "icons" / "app.ico")
+                if (project_root / "resources" / "icons" / "app.ico").exists()
+                else None
+            ),
+            "--add-data",
+            f"{src_path};src",
+            "--hidden-import",
+            "PySide6.QtCore",
+            "--hidden-import",
+            "PySide6.QtGui",
+            "--hidden-import",
+            "PySide6.QtWidgets",
+            "--hidden-import",
+            "pynput",
+            str(main_py),
+        ]
 
-    # Remove None values
-    cmd = [arg for arg in cmd if arg is not None]
+        # Remove None values
+        cmd = [arg for arg in cmd if arg is not None]
 
     print("Building executable...")
     print(" ".join(cmd))
 
+    # Keep PyInstaller's per-user cache next to the project as well
+    env = {**os.environ, "PYINSTALLER_CONFIG_DIR": str(cache_dir / "config")}
+
     try:
-        subprocess.check_call(cmd, cwd=project_root)
+        subprocess.check_call(cmd, cwd=project_root, env=env)
         print("✅ Build successful! Executable created in dist/ folder")
     except subprocess.CalledProcessError as e:
         print(f"❌ Build failed: {e}")
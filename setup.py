@@ -1,158 +1,11 @@
 # clipboard_manager/setup.py
 """
-Legacy setup script for B1Clip (for compatibility)
-Modern packaging should use pyproject.toml
-"""
-import sys
-from pathlib import Path
-
-from setuptools import find_packages, setup
-
-
-def _assert_min_py():
-    if sys.version_info < (3, 9):
-        raise SystemExit("B1Clip requires Python 3.9 or higher")
-
-
-_assert_min_py()
-
-
-# Read version dynamically
-def get_version():
-    """Get version from __init__.py or fallback"""
-    version_file = Path(__file__).parent / "src" / "__init__.py"
-    if version_file.exists():
-        with open(version_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.startswith("__version__"):
-                    return line.split("=")[1].strip().strip("\"'")
-    return "1.0.0"
-
-
-# Read README
-readme_path = Path(__file__).parent / "README.md"
-long_description = (
-    readme_path.read_text(encoding="utf-8") if readme_path.exists() else ""
-)
-
-
-# Read requirements from pyproject.toml or fallback to requirements files
-def read_requirements():
-    """Read base requirements for all platforms"""
-    requirements = []
-
-    # Read from requirements/base.txt (cross-platform)
-    base_req_path = Path(__file__).parent / "requirements" / "base.txt"
-    if base_req_path.exists():
-        try:
-            with open(base_req_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#") and not line.startswith("-r"):
-                        requirements.append(line)
-        except Exception as e:
-            print(f"Warning: Could not read requirements file: {e}")
-
-    if not requirements:
-        # Fallback to minimal requirements if base.txt not found
-        requirements = [
-            "PySide6>=6.5.0",
-            "appdirs>=1.4.0",
-            "setproctitle>=1.3.0",
-            "pynput>=1.7.0",
-            "pillow>=9.5.0",
-            "psutil>=5.9.0",
-        ]
-
-    return requirements
-
-
-# Platform-specific requirements
-def get_platform_requirements():
-    """Get platform-specific requirements"""
-    extras = {}
-
-    # Linux-specific requirements (from requirements/linux.txt)
-    extras["linux"] = [
-        "keyboard>=0.13.5",
-        "evdev>=1.6.0",
-        "python-xlib>=0.33",
-        "plyer>=2.1.0",
-    ]
-
-    # Windows-specific requirements (from requirements/windows.txt)
-    extras["windows"] = ["keyboard>=0.13.5", "pywin32>=306", "wmi>=1.5.1"]
-
-    # Development requirements (sync with requirements/test.txt)
-    extras["dev"] = [
-        "pytest>=7.4.0",
-        "pytest-qt>=4.2.0",
-        "black>=23.0.0",
-        "flake8>=6.0.0",
-        "mypy>=1.5.0",
-        "pre-commit>=3.4.0",
-    ]
-
-    # Test requirements (match requirements/test.txt)
-    extras["test"] = [
-        "pytest>=7.4.0",
-        "pytest-qt>=4.2.0",
-        "iniconfig>=2.0.0",
-        "pluggy>=1.3.0",
-    ]
-
-    return extras
+Legacy setup shim for B1Clip.
 
+All metadata lives in pyproject.toml (PEP 621); setuptools reads it
+natively, so metadata probes no longer re-execute large Python literal
+lists here.
+"""
+from setuptools import setup
 
-setup(
-    name="B1Clip",
-    version=get_version(),  # Dynamic version
-    author="Falcol",
-    author_email="contact@clipboardmanager.dev",
-    description="A modern cross-platform clipboard history manager",
-    long_description=long_description,
-    long_description_content_type="text/markdown",
-    url="https://github.com/falcol/clipboard_manager",
-    project_urls={
-        "Source Code": "https://github.com/falcol/clipboard_manager",
-        "Bug Tracker": "https://github.com/falcol/clipboard_manager/issues",
-        "Documentation": "https://github.com/falcol/clipboard_manager/wiki",
-    },
-    packages=find_packages(where="src"),
-    package_dir={"": "src"},
-    classifiers=[
-        "Development Status :: 4 - Beta",
-        "Intended Audience :: End Users/Desktop",
-        "License :: OSI Approved :: MIT License",
-        "Operating System :: OS Independent",
-        "Operating System :: POSIX :: Linux",
-        "Operating System :: Microsoft :: Windows",
-        "Operating System :: MacOS",
-        "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
-        "Programming Language :: Python :: 3.11",
-        "Programming Language :: Python :: 3.12",
-        "Topic :: Desktop Environment",
-        "Topic :: Utilities",
-        "Environment :: X11 Applications :: Qt",
-    ],
-    python_requires=">=3.9",
-    install_requires=read_requirements(),
-    extras_require=get_platform_requirements(),
-    entry_points={
-        "console_scripts": [
-            "b1clip=main:main",  # Fixed: removed src.
-            "clipboard-manager=main:main",  # Fixed: removed src.
-        ],
-        "gui_scripts": [
-            "b1clip-gui=main:main",  # Fixed: removed src.
-            "clipboard-manager-gui=main:main",  # Fixed: removed src.
-        ],
-    },
-    include_package_data=True,
-    # Removed package_data since resources are in project root, not src/
-    zip_safe=False,
-    keywords="clipboard history manager cross-platform desktop qt pyside6",
-    platforms=["any"],
-)
+setup()
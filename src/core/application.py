@@ -6,10 +6,12 @@ B1Clip main application class
 import contextlib
 import os
 import signal
+import sqlite3
 import sys
+import time
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import QRunnable, QSocketNotifier, Qt, QThreadPool, QTimer
 from PySide6.QtGui import QFont, QFontDatabase
 from PySide6.QtWidgets import QApplication, QMessageBox, QStyleFactory, QSystemTrayIcon
 
@@ -17,9 +19,7 @@ from core.clipboard_watcher import ClipboardWatcher
 from core.content_manager import ContentManager
 from core.database import ClipboardDatabase
 from core.hotkey_manager import HotkeyManager
-from core.search_engine import SearchEngine
 from ui.popup_window import PopupWindow
-from ui.settings_window import SettingsWindow
 from ui.system_tray import SystemTray
 from utils.config import Config
 from utils.logging_config import get_logger
@@ -29,11 +29,86 @@ from utils.single_instance import CrossPlatformSingleInstance
 
 logger = get_logger(__name__)
 
+# Platform resolved once at import - startup paths dispatch on these
+# tables instead of re-testing sys.platform branch by branch
+_PLATFORM = (
+    "windows"
+    if sys.platform.startswith("win")
+    else "darwin" if sys.platform.startswith("darwin") else "linux"
+)
+
+_UI_FONT_FAMILIES = {
+    "windows": (["Segoe UI", "Noto Sans", "Arial", "Sans Serif"], 9),
+    "darwin": (
+        [
+            "Ubuntu",
+            "DejaVu Sans",
+            ".SF NS Text",
+            "Helvetica Neue",
+            "Noto Sans",
+            "Arial",
+            "Sans Serif",
+        ],
+        12,  # macOS default UI size is larger
+    ),
+    "linux": (
+        ["Noto Sans", "Ubuntu", "DejaVu Sans", "Segoe UI", "Arial", "Sans Serif"],
+        10,
+    ),
+}
+
+_HOTKEY_DISPLAY = {
+    "windows": "Windows+Alt",
+    "linux": "Super+Alt",
+    "darwin": "Cmd+Alt",
+}
+
+
+class _MaintenanceTask(QRunnable):
+    """Runs the maintenance pass on a pool thread.
+
+    Safe off the GUI thread: the database serializes its single
+    connection behind an RLock (check_same_thread=False) and the watcher
+    already writes from executor threads.
+    """
+
+    def __init__(self, manager):
+        super().__init__()
+        self._manager = manager
+        self.setAutoDelete(True)
+
+    def run(self):
+        self._manager._maintenance_body()
+
 
 class ClipboardManager:
     """B1Clip with modern UI and auto-hide focus"""
 
+    # Resolved UI font, shared process-wide: QFontDatabase enumeration is
+    # the expensive part, so repeated instantiations reuse the first result
+    _cached_ui_font = None
+
+    # Theme name -> stylesheet file; constant, so built once at import
+    _AVAILABLE_THEMES = {
+        "dark_win11": "themes/dark_win11.qss",
+        "dark_amoled": "themes/dark_amoled.qss",
+        "dark_solarized": "themes/dark_solarized.qss",
+        "nord": "themes/nord.qss",
+        "vespera": "themes/vespera.qss",
+        "dracula": "themes/dracula.qss",
+        "onedark_pro": "themes/onedark_pro.qss",
+        "gruvbox": "themes/gruvbox.qss",
+    }
+
     def __init__(self):
+        # Attributes read on shutdown/settings paths, initialized up
+        # front so guards are plain None checks instead of hasattr/getattr
+        self.cleanup_timer = None
+        self.hotkey_manager = None
+        self._signal_notifier = None
+        self._single_instance: CrossPlatformSingleInstance | None = None
+        self._cleanup_done = False
+
         # Setup Qt environment
         setup_qt_environment()
 
@@ -67,7 +142,6 @@ class ClipboardManager:
 
         # Initialize configuration
         self.config = Config()
-        self._single_instance: CrossPlatformSingleInstance | None = None
 
         # Initialize data directory (only 1 database)
         self.data_dir = Path(self.config.config_path.parent)
@@ -76,39 +150,53 @@ class ClipboardManager:
         # Initialize core components (migration automatically in database)
         self.database = ClipboardDatabase(self.db_path)
         self.content_manager = ContentManager(self.data_dir)
-        self.search_engine = SearchEngine(self.database)
+        self._search_engine = None
 
         # Initialize clipboard watcher
         self.clipboard_watcher = ClipboardWatcher(
             self.database, self.content_manager, self.config
         )
 
-        # Initialize UI components
+        # Initialize UI components. The settings window is deferred: it
+        # loads QSS and builds full widget trees, none of which is needed
+        # until the user opens it from the tray menu.
         self.popup_window = PopupWindow(self.database, self.config)
-        self.settings_window = SettingsWindow(self.config)
-        self.system_tray = SystemTray(self.popup_window, self.settings_window)
+        self._settings_window = None
+        self.system_tray = SystemTray(self.popup_window, lambda: self.settings_window)
 
         # Set system_tray reference in popup_window
         self.popup_window.system_tray = self.system_tray
 
+        # One persistent debounce timer for popup reloads: bursts of
+        # clipboard changes collapse into a single deferred refresh
+        self._reload_timer = QTimer()
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(100)
+        self._reload_timer.timeout.connect(self._deferred_reload)
+
+        # Preallocated timer for the one-off startup notification; the
+        # QTimer.singleShot convenience allocates and wires a fresh
+        # timer per call
+        self._startup_notice_timer = QTimer()
+        self._startup_notice_timer.setSingleShot(True)
+        self._startup_notice_timer.setInterval(1000)
+        self._startup_notice_timer.timeout.connect(self._show_startup_notification)
+        self._startup_hotkey_display = ""
+
         # Initialize hotkey manager driven by Config
         self.hotkey_manager = HotkeyManager(self.show_popup, self.config)
 
         # Initialize QSS loader
         self.qss_loader = QSSLoader()
+        self._last_theme = None
+
+        # Hot config values snapshotted for the per-copy path; refreshed
+        # in on_settings_changed
+        self._notifications_enabled = self.config.get("show_notifications", False)
 
         # Setup connections
         self.setup_connections()
 
-        # Check system tray availability
-        if not QSystemTrayIcon.isSystemTrayAvailable():
-            QMessageBox.critical(
-                None,
-                "System Tray",
-                "System tray is not available on this system.\n"
-                "The application will run in background mode.",
-            )
-
         # Setup performance monitoring
         self.setup_performance_monitoring()
 
@@ -138,10 +226,33 @@ class ClipboardManager:
         )
         sys.exit(1)
 
+    @property
+    def search_engine(self):
+        """Search engine, constructed on first access"""
+        if self._search_engine is None:
+            from core.search_engine import SearchEngine
+
+            self._search_engine = SearchEngine(self.database)
+        return self._search_engine
+
+    @property
+    def settings_window(self):
+        """Settings window, constructed on first access.
+
+        The import lives here too, keeping the settings widget module
+        out of the startup import graph entirely.
+        """
+        if self._settings_window is None:
+            from ui.settings_window import SettingsWindow
+
+            self._settings_window = SettingsWindow(self.config)
+            self._settings_window.settings_changed.connect(self.on_settings_changed)
+        return self._settings_window
+
     def setup_connections(self):
         """Setup signal connections between components"""
-        # Settings changes
-        self.settings_window.settings_changed.connect(self.on_settings_changed)
+        # Settings changes are connected when the settings window is
+        # first constructed (see the settings_window property)
 
         # System tray
         self.system_tray.quit_requested.connect(self.quit_application)
@@ -152,71 +263,127 @@ class ClipboardManager:
         # Apply QSS to all components
         self._apply_qss_styles()
 
+        # Final cleanup runs once whichever path quits the app
+        self.app.aboutToQuit.connect(self._final_cleanup)
+
     def setup_performance_monitoring(self):
         """Setup performance monitoring and cleanup"""
-        # Periodic cleanup timer
+        # On-demand cleanup: a single-shot timer armed by the first
+        # clipboard change after the previous pass. Unlike a periodic
+        # timer this never wakes an idle process - no changes, no pass.
         self.cleanup_timer = QTimer()
-        self.cleanup_timer.timeout.connect(self.perform_maintenance)
+        self.cleanup_timer.setSingleShot(True)
+        self.cleanup_timer.timeout.connect(self._maybe_maintain)
 
         cleanup_interval = (
             self.config.get("cleanup_interval_hours", 24) * 3600000
         )  # Convert to ms
-        self.cleanup_timer.start(cleanup_interval)
+        self.cleanup_timer.setInterval(cleanup_interval)
+        self._last_cleanup_interval_ms = cleanup_interval
+        self._dirty_since = None
 
         logger.info(
-            f"Performance monitoring enabled, cleanup every {cleanup_interval // 3600000} hours"
+            "Performance monitoring enabled, cleanup %s hours after last change",
+            cleanup_interval // 3600000,
         )
 
+    def _maybe_maintain(self):
+        """Run maintenance only if clipboard changes have accrued"""
+        if self._dirty_since is None:
+            return
+        self._dirty_since = None
+        self.perform_maintenance()
+
     def perform_maintenance(self):
-        """Perform periodic maintenance tasks"""
+        """Run maintenance off the GUI thread.
+
+        The file-system walk and DB scan would stutter the UI on large
+        caches if run on the main thread.
+        """
+        QThreadPool.globalInstance().start(_MaintenanceTask(self))
+
+    def _maintenance_body(self):
+        """Perform periodic maintenance tasks (pool thread)"""
         try:
 
             logger.info("Performing scheduled maintenance...")
 
             # Cleanup orphaned files
-            active_file_paths = set()
-            items = self.database.get_items(limit=1000)
-            for item in items:
-                if item.get("file_path"):
-                    active_file_paths.add(item["file_path"])
-                if item.get("thumbnail_path"):
-                    active_file_paths.add(item["thumbnail_path"])
-
-            self.content_manager.cleanup_orphaned_files(active_file_paths)
-
-            # Database cleanup
-            stats_before = self.database.get_stats()
-            # The database cleanup is handled automatically in the database class
-            stats_after = self.database.get_stats()
-
-            logger.info(
-                f"Maintenance complete. Items: {stats_before.get('total_items', 0)} -> {stats_after.get('total_items', 0)}"
-            )
+            self._do_cleanup_pass()
 
-        except Exception as e:
+            # Database cleanup happens automatically in the database
+            # class, so one stats query is enough for the report
+            stats = self.database.get_stats()
+
+            logger.info("Maintenance complete. Items: %s", stats.get("total_items", 0))
+
+        except sqlite3.Error:
+            logger.exception("Maintenance DB error")
+        except Exception:
+            logger.exception("Error during maintenance")
 
-            logger.error(f"Error during maintenance: {e}")
+    def _deferred_reload(self):
+        """Debounced popup refresh - skip if it was hidden meanwhile"""
+        if self.popup_window.isVisible():
+            self.popup_window.load_items()
+
+    def _show_startup_notification(self):
+        """Show the startup hint once the tray has settled"""
+        self.system_tray.show_notification(
+            "B1Clip Started",
+            f"Press {self._startup_hotkey_display} to open clipboard history",
+            3000,
+        )
+
+    def _do_cleanup_pass(self):
+        """Orphaned-file cleanup shared by maintenance and shutdown.
+
+        Fetches the referenced paths with a single two-column projection
+        instead of hydrating full item dicts.
+        """
+        active_file_paths = self.database.get_active_file_paths()
+        self.content_manager.cleanup_orphaned_files(active_file_paths)
+
+    def _final_cleanup(self):
+        """Run the shutdown cleanup pass exactly once"""
+        if self._cleanup_done:
+            return
+        self._cleanup_done = True
+        try:
+            self._do_cleanup_pass()
+        except (sqlite3.Error, OSError):
+            logger.exception("Error during final cleanup")
 
     def on_content_changed(self, content_type: str, item_data: dict):
         """Handle new clipboard content with features and notifications"""
 
-        logger.info(f"New {content_type} content detected: {item_data.get('id')}")
+        # %-style args are only formatted if the record passes the level
+        # filter - keeps the per-copy hot path allocation free at WARNING+
+        logger.info("New %s content detected: %s", content_type, item_data.get("id"))
+
+        # Arm the deferred maintenance pass
+        self._dirty_since = time.monotonic()
+        if not self.cleanup_timer.isActive():
+            self.cleanup_timer.start()
 
         # Show notification for new content (if enabled)
-        if self.config.get("show_notifications", False):
-            preview = ""
+        if self._notifications_enabled:
             if content_type == "text":
                 preview = item_data.get("preview", "")
             elif content_type == "image":
-                width = item_data.get("width", 0)
-                height = item_data.get("height", 0)
-                preview = f"{width}×{height} pixels"
+                preview = (
+                    f"{item_data.get('width', 0)}×"
+                    f"{item_data.get('height', 0)} pixels"
+                )
+            else:
+                preview = ""
 
             self.system_tray.show_new_item_notification(content_type, preview)
 
-        # Update popup if visible
-        if self.popup_window.isVisible():
-            QTimer.singleShot(100, self.popup_window.load_items)
+        # Update popup if visible - debounced, so N changes inside the
+        # interval trigger one reload instead of N
+        if self.popup_window.isVisible() and not self._reload_timer.isActive():
+            self._reload_timer.start()
 
     def show_popup(self):
         """Show the clipboard popup window"""
@@ -239,17 +406,23 @@ class ClipboardManager:
             # Update all components
             self.clipboard_watcher.update_config()
             self.popup_window.update_config()
+            self._notifications_enabled = self.config.get("show_notifications", False)
 
-            # Update cleanup timer if interval changed
+            # Update cleanup timer only if the interval actually changed;
+            # an unconditional start() would reset the maintenance
+            # schedule on every unrelated settings change
             cleanup_interval = self.config.get("cleanup_interval_hours", 24) * 3600000
-            self.cleanup_timer.start(cleanup_interval)
+            if cleanup_interval != self._last_cleanup_interval_ms:
+                # Takes effect when the timer is next armed
+                self.cleanup_timer.setInterval(cleanup_interval)
+                self._last_cleanup_interval_ms = cleanup_interval
 
             # Apply theme immediately, no need to restart
             self._apply_qss_styles()
 
             # Update hotkey manager from config (if hotkey changed)
             with contextlib.suppress(Exception):
-                if getattr(self, "hotkey_manager", None):
+                if self.hotkey_manager is not None:
                     self.hotkey_manager.update_from_config()
 
             logger.info("All components updated with new settings")
@@ -261,20 +434,11 @@ class ClipboardManager:
         """Apply QSS stylesheets to entire app (global)"""
         try:
             # Validate theme against available theme files and fallback safely
-            available_themes = {
-                "dark_win11": "themes/dark_win11.qss",
-                "dark_amoled": "themes/dark_amoled.qss",
-                "dark_solarized": "themes/dark_solarized.qss",
-                "nord": "themes/nord.qss",
-                "vespera": "themes/vespera.qss",
-                "dracula": "themes/dracula.qss",
-                "onedark_pro": "themes/onedark_pro.qss",
-                "gruvbox": "themes/gruvbox.qss",
-            }
-
             theme_name = self.config.get("theme", "dark_win11")
-            theme_file = available_themes.get(
-                theme_name, available_themes["dark_win11"]
+            if theme_name == self._last_theme:
+                return  # Theme unchanged - skip the reload and re-parse
+            theme_file = self._AVAILABLE_THEMES.get(
+                theme_name, self._AVAILABLE_THEMES["dark_win11"]
             )
 
             # Apply globally: main + theme
@@ -288,7 +452,8 @@ class ClipboardManager:
                 except Exception:
                     pass
 
-            logger.info(f"Applied global theme: {theme_name}")
+            self._last_theme = theme_name
+            logger.info("Applied global theme: %s", theme_name)
         except Exception as e:
 
             logger.error(f"Error applying global QSS: {e}")
@@ -307,26 +472,34 @@ class ClipboardManager:
                 # Show startup notification with platform-specific hotkey
                 hotkey_info = self.hotkey_manager.get_hotkey_info()
                 platform_name = hotkey_info["platform"]
-
-                if platform_name == "windows":
-                    hotkey_display = "Windows+Alt"
-                elif platform_name == "linux":
-                    hotkey_display = "Super+Alt"
-                else:
-                    hotkey_display = "Cmd+Alt"
-
-                QTimer.singleShot(
-                    1000,
-                    lambda: self.system_tray.show_notification(
-                        "B1Clip Started",
-                        f"Press {hotkey_display} to open clipboard history",
-                        3000,
-                    ),
+                self._startup_hotkey_display = _HOTKEY_DISPLAY.get(
+                    platform_name, _HOTKEY_DISPLAY["darwin"]
                 )
+                self._startup_notice_timer.start()
 
             logger.info("B1Clip started successfully")
 
-            # Setup graceful shutdown
+            # Check tray availability from inside the event loop: on X11
+            # isSystemTrayAvailable() is a synchronous window-manager
+            # round-trip, so keep it off the first-frame path
+            QTimer.singleShot(0, self._check_tray_available)
+
+            # Setup graceful shutdown. Qt only notices a Python signal
+            # handler on its next event-loop wakeup (up to ~100 ms); a
+            # wakeup pipe watched by a QSocketNotifier delivers it to the
+            # loop immediately instead. Not on Windows: QSocketNotifier
+            # cannot watch an os.pipe() fd there and os.set_blocking only
+            # gained Windows support in 3.12, so the handler falls back
+            # to queueing the shutdown on the event loop.
+            if _PLATFORM != "windows":
+                self._signal_read_fd, signal_write_fd = os.pipe()
+                os.set_blocking(self._signal_read_fd, False)
+                os.set_blocking(signal_write_fd, False)
+                signal.set_wakeup_fd(signal_write_fd)
+                self._signal_notifier = QSocketNotifier(
+                    self._signal_read_fd, QSocketNotifier.Type.Read
+                )
+                self._signal_notifier.activated.connect(self._on_signal_fd)
             signal.signal(signal.SIGINT, self.signal_handler)
             signal.signal(signal.SIGTERM, self.signal_handler)
 
@@ -341,11 +514,34 @@ class ClipboardManager:
             logger.error(f"Failed to start application: {e}")
             return 1
 
+    def _check_tray_available(self):
+        """Warn if the system tray is unavailable"""
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            QMessageBox.critical(
+                None,
+                "System Tray",
+                "System tray is not available on this system.\n"
+                "The application will run in background mode.",
+            )
+
     def signal_handler(self, signum, frame):
-        """Handle system signals for graceful shutdown"""
+        """Registered so the C-level handler writes the wakeup fd.
+
+        The actual shutdown runs from _on_signal_fd when the event loop
+        services the pipe - no work happens in signal context. Without a
+        wakeup pipe (Windows) the shutdown is queued on the event loop
+        directly instead.
+        """
+        logger.info("Received signal %s, shutting down gracefully...", signum)
+        if self._signal_notifier is None:
+            QTimer.singleShot(0, self.quit_application)
 
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
-        QTimer.singleShot(0, self.quit_application)
+    def _on_signal_fd(self):
+        """Drain the signal wakeup pipe and shut down"""
+        self._signal_notifier.setEnabled(False)
+        with contextlib.suppress(OSError):
+            os.read(self._signal_read_fd, 64)
+        self.quit_application()
 
     def quit_application(self):
         """Quit the application gracefully with cleanup"""
@@ -354,7 +550,7 @@ class ClipboardManager:
             logger.info("Starting graceful shutdown...")
 
             # Stop timers
-            if hasattr(self, "cleanup_timer"):
+            if self.cleanup_timer is not None:
                 self.cleanup_timer.stop()
 
             # Stop core components
@@ -365,38 +561,25 @@ class ClipboardManager:
             self.system_tray.hide()
             if self.popup_window.isVisible():
                 self.popup_window.hide()
-            if self.settings_window.isVisible():
-                self.settings_window.hide()
+            if self._settings_window is not None and self._settings_window.isVisible():
+                self._settings_window.hide()
 
-            # Final cleanup
-            active_file_paths = set()
-            try:
-                items = self.database.get_items(limit=1000)
-                for item in items:
-                    if item.get("file_path"):
-                        active_file_paths.add(item["file_path"])
-                    if item.get("thumbnail_path"):
-                        active_file_paths.add(item["thumbnail_path"])
-
-                self.content_manager.cleanup_orphaned_files(active_file_paths)
-            except Exception as e:
-                logger.error(f"Error during final cleanup: {e}")
+            # Final cleanup (idempotent - also wired to aboutToQuit)
+            self._final_cleanup()
 
             # Close database
             self.database.close()
 
             # Release single-instance lock if we own it (when started via main)
             with contextlib.suppress(Exception):
-                single = getattr(self, "_single_instance", None)
-                if single is not None:
+                if self._single_instance is not None:
                     # Method exists on CrossPlatformSingleInstance
-                    single.release_lock()  # type: ignore[attr-defined]
+                    self._single_instance.release_lock()
             logger.info("Graceful shutdown completed")
             self.app.quit()
 
-        except Exception as e:
-
-            logger.error(f"Error during shutdown: {e}")
+        except Exception:
+            logger.exception("Error during shutdown")
             # Force quit if graceful shutdown fails
             self.app.quit()
 
@@ -407,41 +590,24 @@ class ClipboardManager:
         - macOS: .SF NS Text / Helvetica Neue
         - Linux: Noto Sans (preferred), Ubuntu, DejaVu Sans
         """
+        if ClipboardManager._cached_ui_font is not None:
+            return ClipboardManager._cached_ui_font
         try:
-            families_by_platform = []
-            if sys.platform.startswith("win"):
-                families_by_platform = ["Segoe UI", "Noto Sans", "Arial", "Sans Serif"]
-                point_size = 9
-            elif sys.platform.startswith("darwin"):
-                families_by_platform = [
-                    "Ubuntu",
-                    "DejaVu Sans",
-                    ".SF NS Text",
-                    "Helvetica Neue",
-                    "Noto Sans",
-                    "Arial",
-                    "Sans Serif",
-                ]
-                point_size = 12  # macOS default UI size is larger
-            else:
-                # Linux
-                families_by_platform = [
-                    "Noto Sans",
-                    "Ubuntu",
-                    "DejaVu Sans",
-                    "Segoe UI",
-                    "Arial",
-                    "Sans Serif",
-                ]
-                point_size = 10
-
-            db = QFontDatabase()
+            families_by_platform, point_size = _UI_FONT_FAMILIES[_PLATFORM]
+
+            # One set() of the installed families instead of an O(N) list
+            # scan per candidate
+            available = set(QFontDatabase().families())
             for family in families_by_platform:
-                if family in db.families():
-                    return QFont(family, point_size)
+                if family in available:
+                    ClipboardManager._cached_ui_font = QFont(family, point_size)
+                    return ClipboardManager._cached_ui_font
 
             # Fallback to current app font but adjust size for readability
-            return QFont(self.app.font().family(), point_size)
+            ClipboardManager._cached_ui_font = QFont(
+                self.app.font().family(), point_size
+            )
+            return ClipboardManager._cached_ui_font
         except Exception:
             # Absolute fallback
             return QFont("Sans Serif", 10)
@@ -457,7 +623,10 @@ class ClipboardManager:
                 "clipboard_watching": self.clipboard_watcher.running,
                 "hotkey_active": self.hotkey_manager.running,
                 "popup_visible": self.popup_window.isVisible(),
-                "settings_visible": self.settings_window.isVisible(),
+                "settings_visible": (
+                    self._settings_window is not None
+                    and self._settings_window.isVisible()
+                ),
             }
         except Exception as e:
 
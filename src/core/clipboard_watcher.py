@@ -8,12 +8,16 @@ clipboard watcher with improved content management
 """
 import hashlib
 import logging
+import re
+import time
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
+from html import unescape
 from typing import Optional
 
-from PySide6.QtCore import QObject, QTimer
+from PySide6.QtCore import QObject, Qt, QTimer
 from PySide6.QtCore import Signal as pyqtSignal
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
 from PySide6.QtWidgets import QApplication
 
 from core.content_manager import ContentManager
@@ -23,6 +27,63 @@ from utils.config import Config
 logger = logging.getLogger(__name__)
 
 
+# Structural wrapper markup that carries no formatting: comments,
+# doctype, and bare html/head/body/p/pre tags (meta may keep its
+# charset attribute). Anything outside this set - <b>, <a href=...>,
+# styled spans - is real formatting and disqualifies the drop.
+_WRAPPER_RE = re.compile(
+    r"<!--.*?-->|<!DOCTYPE[^>]*>|</?(?:html|head|body|p|pre)>|<meta\b[^>]*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Pre-built original_mime_types tuples indexed by a presence bitmask
+# (text=1, html=2, rtf=4, image=8) - one table lookup per event instead
+# of four conditional list appends
+_MIME_TABLE = tuple(
+    tuple(
+        name
+        for bit, name in (
+            (1, "text/plain"),
+            (2, "text/html"),
+            (4, "text/rtf"),
+            (8, "image"),
+        )
+        if bits & bit
+    )
+    for bits in range(16)
+)
+
+
+def _preview(content: str, limit: int = 150) -> str:
+    """Truncated preview; returns the original string when short enough"""
+    return content if len(content) <= limit else content[:limit] + "..."
+
+
+# Hash objects pre-primed with "<fmt>:" - copied per call so the
+# constructor and prefix feed run once per format, not per event
+_hash_prefixes: dict = {}
+
+
+def _hash_key(fmt: str, content) -> str:
+    """Fast dedup key: BLAKE2b with a 64-bit digest.
+
+    The hash only guards local deduplication, so a short, fast digest
+    beats SHA-256 (notably on multi-MB payloads). The format prefix is
+    baked into a cached hash object and copy()d, so each call only
+    touches the content itself. Accepts str or bytes content so RTF
+    payloads can be hashed without a decode/re-encode round trip.
+    """
+    base = _hash_prefixes.get(fmt)
+    if base is None:
+        base = hashlib.blake2b(digest_size=8)
+        base.update(fmt.encode())
+        base.update(b":")
+        _hash_prefixes[fmt] = base
+    h = base.copy()
+    h.update(content if isinstance(content, bytes) else content.encode())
+    return h.hexdigest()
+
+
 class ClipboardWatcher(QObject):
     """clipboard watcher with intelligent content management"""
 
@@ -39,7 +100,16 @@ class ClipboardWatcher(QObject):
         self.content_manager = content_manager
         self.config = config
         self.clipboard = QApplication.clipboard()
-        self.last_content_hash = None
+        # LRU of recent content hashes: dedup survives A-B-A copy
+        # sequences instead of only catching the immediately previous item
+        self._seen_hashes: OrderedDict = OrderedDict()
+        self._last_fingerprint = None
+        self._last_text_fp = None
+        # cacheKey of the last pixmap handed to the image pipeline -
+        # O(1) duplicate rejection before even the QImage conversion
+        self._last_pixmap_cache_key = 0
+        # Perceptual hashes of recently stored images for near-dup dedup
+        self._recent_phashes: deque = deque(maxlen=32)
         self.running = False
         # Polling timer fallback (Wayland, edge cases)
         self.timer = QTimer()
@@ -49,6 +119,9 @@ class ClipboardWatcher(QObject):
         self._debounce_timer = QTimer()
         self._debounce_timer.setSingleShot(True)
         self._debounce_timer.timeout.connect(self.check_clipboard)
+        # Deadline capping the total debounce delay: restarting the
+        # timer on every signal must not postpone processing forever
+        self._debounce_deadline = 0.0
 
         # Prefer Qt clipboard signal over polling when available
         try:
@@ -60,11 +133,23 @@ class ClipboardWatcher(QObject):
         # Background executor for DB writes and heavy tasks (avoid UI freeze)
         self._executor = ThreadPoolExecutor(max_workers=2)
 
+        # Hot config values snapshotted as attributes; refreshed by
+        # update_config instead of a dict lookup per clipboard change
+        self._max_text_length = int(self.config.get("max_text_length", 1000000))
+        self._debounce_ms = max(
+            50, min(250, int(self.config.get("clipboard_signal_debounce_ms", 120)))
+        )
+
     def start(self):
         """Start clipboard monitoring"""
         self.running = True
-        # Start polling only if signal cannot be used
-        if not getattr(self, "_signal_connected", False):
+        # Poll only when dataChanged cannot be trusted: the connect
+        # failed, or Wayland, where the signal is unreliable for changes
+        # made by other clients
+        if (
+            not self._signal_connected
+            or QGuiApplication.platformName() == "wayland"
+        ):
             poll_ms = int(self.config.get("clipboard_poll_ms", 300))
             self.timer.start(poll_ms)  # Fallback polling
         logger.info("clipboard watcher started")
@@ -72,6 +157,10 @@ class ClipboardWatcher(QObject):
     def stop(self):
         """Stop clipboard monitoring"""
         self.running = False
+        self._last_fingerprint = None
+        self._last_text_fp = None
+        self._last_pixmap_cache_key = 0
+        self._debounce_deadline = 0.0
         self.timer.stop()
         self._debounce_timer.stop()
         # Ensure background workers do not keep the process alive
@@ -87,85 +176,137 @@ class ClipboardWatcher(QObject):
         """Debounced handler for clipboard dataChanged signal."""
         if not self.running:
             return
-        # Debounce bursts (apps may emit multiple changes rapidly)
-        interval_ms = max(
-            50, min(250, int(self.config.get("clipboard_signal_debounce_ms", 120)))
+        # Debounce bursts (apps may emit multiple changes rapidly), but
+        # cap the total delay: some apps (Chromium) fire several
+        # dataChanged events per copy, and restarting the timer each
+        # time would push processing out indefinitely under a storm.
+        now = time.monotonic()
+        if not self._debounce_deadline:
+            self._debounce_deadline = now + 0.25
+        remaining = max(
+            0.02, min(self._debounce_ms / 1000, self._debounce_deadline - now)
         )
-        self._debounce_timer.start(interval_ms)
+        self._debounce_timer.start(int(remaining * 1000))
 
     def check_clipboard(self):
         """clipboard change detection - preserve ALL formats like Windows"""
         if not self.running:
             return
 
+        # A run is the burst's endpoint: re-arm the deadline for the next
+        self._debounce_deadline = 0.0
+
         try:
             mime_data = self.clipboard.mimeData()
 
-            # [DISABLED] Skip Windows-like file list clipboard (file copies)
-            try:
-                if (
-                    hasattr(mime_data, "hasUrls") and mime_data.hasUrls()
-                ) or mime_data.hasFormat("text/uri-list"):
-                    logger.debug("Skipping file/URL clipboard content (text/uri-list)")
-                    return
-            except Exception:
-                pass
-
-            # Collect ALL available formats (Windows-like behavior)
-            available_formats = {
-                "text": mime_data.text() if mime_data.hasText() else None,
-                "html": mime_data.html() if mime_data.hasHtml() else None,
-                "rtf": None,
-                "image": mime_data.hasImage(),
-            }
-
-            # Handle RTF
-            if mime_data.hasFormat("text/rtf"):
-                rtf_data = mime_data.data("text/rtf")
-                available_formats["rtf"] = bytes(rtf_data.data()).decode(
-                    "utf-8", errors="ignore"
+            # Skip file-list clipboard content (file copies); hasUrls()
+            # already covers text/uri-list internally, so one call is
+            # enough - no hasattr guard, QMimeData has always had it
+            if mime_data.hasUrls():
+                logger.debug("Skipping file/URL clipboard content (text/uri-list)")
+                return
+
+            text = mime_data.text() if mime_data.hasText() else None
+
+            # Fast reject: the advertised format list plus a cheap
+            # (length, edge-bytes) fingerprint of the text payload catches
+            # repeated change notifications for identical content before
+            # any HTML/RTF decode or full hash. The format tuple also
+            # catches the same text reappearing with different secondary
+            # formats (e.g. plain re-copy of a browser selection).
+            if text:
+                fingerprint = (
+                    tuple(mime_data.formats()),
+                    len(text),
+                    hash(text[:64] + text[-64:]),
                 )
+                if fingerprint == self._last_fingerprint:
+                    return
+                self._last_fingerprint = fingerprint
+
+            # Collect available formats as locals - presence checks
+            # first, payloads only for formats that are actually there
+            # (Windows-like behavior, without a per-event dict)
+            html = mime_data.html() if mime_data.hasHtml() else None
+            has_image = mime_data.hasImage()
+
+            # RTF kept as raw bytes: hashing works on bytes directly,
+            # and the UTF-8 decode only happens in the worker if RTF
+            # actually ends up as the stored format
+            rtf = (
+                bytes(mime_data.data("text/rtf").data())
+                if mime_data.hasFormat("text/rtf")
+                else None
+            )
 
-            # Determine primary content and format (like Windows logic)
-            primary_content = None
-            primary_format = "plain"
-            original_mime_types = []
-
-            # Build mime types list
-            if available_formats["text"]:
-                original_mime_types.append("text/plain")
-            if available_formats["html"]:
-                original_mime_types.append("text/html")
-            if available_formats["rtf"]:
-                original_mime_types.append("text/rtf")
-            if available_formats["image"]:
-                original_mime_types.append("image")
+            # Many apps advertise text/html that is just the plain text
+            # in a bare structural wrapper; storing both doubles the DB
+            # payload for nothing. Only drop the HTML when removing that
+            # wrapper leaves no markup at all and the remainder is the
+            # plain text verbatim - formatting, links and styles must
+            # survive ("preserve ALL formats").
+            if html and text:
+                candidate = _WRAPPER_RE.sub("", html)
+                if (
+                    "<" not in candidate
+                    and unescape(candidate).strip() == text.strip()
+                ):
+                    html = None
+
+            # Mime types via bitmask lookup into the pre-built table
+            bits = (
+                bool(text)
+                | bool(html) << 1
+                | bool(rtf) << 2
+                | has_image << 3
+            )
+            original_mime_types = _MIME_TABLE[bits]
 
             # Choose primary content (Windows prioritizes meaningful text)
-            if available_formats["text"] and available_formats["text"].strip():
-                primary_content = available_formats["text"]
+            if text and text.strip():
+                primary_content = text
                 primary_format = "plain"
                 # But we'll store HTML too if available
-            elif available_formats["html"] and available_formats["html"].strip():
-                primary_content = available_formats["html"]
+            elif html and html.strip():
+                primary_content = html
                 primary_format = "html"
-            elif available_formats["rtf"]:
-                primary_content = available_formats["rtf"]
+            elif rtf:
+                primary_content = rtf  # bytes
                 primary_format = "rtf"
-            elif available_formats["image"]:
+            elif has_image:
                 self.handle_image_content(self.clipboard.pixmap())
                 return
             else:
                 return
 
-            # Handle multi-format content (Windows-like)
+            # Handle multi-format content (Windows-like); the dict is
+            # built once here, on actual changes only, for the handler's
+            # metadata - never on the per-tick path
             self.handle_multi_format_content(
-                primary_content, primary_format, available_formats, original_mime_types
+                primary_content,
+                primary_format,
+                {"text": text, "html": html, "rtf": rtf, "image": has_image},
+                original_mime_types,
             )
 
         except Exception as e:
             logger.error(f"Error checking clipboard: {e}")
 
+    def _seen(self, content_hash: str) -> bool:
+        """Check-and-record against the bounded LRU of recent hashes.
+
+        Returns True when the hash was already seen (and refreshes its
+        recency); otherwise records it, evicting the oldest entry past
+        256, and returns False.
+        """
+        if content_hash in self._seen_hashes:
+            self._seen_hashes.move_to_end(content_hash)
+            return True
+        self._seen_hashes[content_hash] = None
+        if len(self._seen_hashes) > 256:
+            self._seen_hashes.popitem(last=False)
+        return False
+
     def handle_text_content(
         self, content: str, content_type: str, mime_types: Optional[list] = None
     ):
@@ -173,16 +314,22 @@ class ClipboardWatcher(QObject):
         if not content or not content.strip():
             return
 
+        # Cheap fingerprint gate: an identical re-copy returns after a
+        # length check and two small slice compares, before the full
+        # encode and hash touch the payload
+        fp = (len(content), content[:64], content[-64:])
+        if fp == self._last_text_fp:
+            return
+        self._last_text_fp = fp
+
         # Generate content hash for deduplication
-        combined = f"{content_type}:{content}"
-        content_hash = hashlib.sha256(combined.encode()).hexdigest()[:16]
+        content_hash = _hash_key(content_type, content)
 
-        if content_hash == self.last_content_hash:
+        if self._seen(content_hash):
             return
 
         # Skip very large content
-        max_length = self.config.get("max_text_length", 1000000)
-        if len(content) > max_length:
+        if len(content) > self._max_text_length:
             logger.warning(f"Text content too large ({len(content)} chars), skipping")
             return
 
@@ -199,20 +346,19 @@ class ClipboardWatcher(QObject):
         def _worker():
             try:
                 item_id = self.database.add_text_item(
-                    content=content, metadata=metadata
+                    content=content,
+                    metadata=metadata,
+                    content_hash=content_hash,
                 )
                 if item_id > 0:
-                    # Update last hash and emit signal back to UI (queued)
-                    self.last_content_hash = content_hash
+                    # Emit signal back to UI (queued)
                     item_data = {
                         "id": item_id,
                         "content_type": "text",
                         "content": content,
                         "format": content_type,
                         "original_mime_types": mime_types,
-                        "preview": (
-                            content[:150] + "..." if len(content) > 150 else content
-                        ),
+                        "preview": _preview(content),
                     }
                     self.content_changed.emit("text", item_data)
                     logger.debug(
@@ -223,63 +369,121 @@ class ClipboardWatcher(QObject):
 
         self._executor.submit(_worker)
 
+    @staticmethod
+    def _dhash(source: QImage) -> int:
+        """64-bit difference hash of an image.
+
+        Downscale to 9x8 grayscale and compare horizontally adjacent
+        pixels - near-identical images (cursor blink, single-pixel diff)
+        land within a few bits of each other.
+        """
+        image = (
+            source
+            .scaled(
+                9,
+                8,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            .convertToFormat(QImage.Format.Format_Grayscale8)
+        )
+        bits = 0
+        for y in range(8):
+            for x in range(8):
+                bits = (bits << 1) | (
+                    image.pixelColor(x, y).red() > image.pixelColor(x + 1, y).red()
+                )
+        return bits
+
+    @staticmethod
+    def _raw_image_hash(source: QImage) -> str:
+        """Exact dedup key from the raw ARGB32 pixels.
+
+        Hashing the pixel buffer directly means a repeat copy is
+        rejected before any PNG encode or thumbnail generation.
+        """
+        image = source.convertToFormat(QImage.Format.Format_ARGB32)
+        h = hashlib.blake2b(digest_size=8)
+        h.update(image.constBits())
+        return h.hexdigest()
+
     def handle_image_content(self, pixmap: QPixmap):
         """image content handling"""
         if pixmap.isNull():
             return
 
+        # cacheKey() identifies the underlying pixel data; when Qt hands
+        # us the same pixmap again the tick costs one integer compare.
+        # Distinct copies of identical pixels get fresh keys, but those
+        # only fall through to the hash-based gates in the worker.
+        cache_key = pixmap.cacheKey()
+        if cache_key == self._last_pixmap_cache_key:
+            return
+        self._last_pixmap_cache_key = cache_key
+
+        # QPixmap is GUI-thread-only: snapshot dimensions and convert to
+        # a QImage (an independent copy) here, then hand the expensive
+        # part - dedup hashing, PNG encode, file and DB writes - to the
+        # executor. A 4K screenshot costs 50-200ms to encode, which used
+        # to stall the event loop.
+        width, height = pixmap.width(), pixmap.height()
+        self._executor.submit(self._image_worker, pixmap.toImage(), width, height)
+
+    def _image_worker(self, image: QImage, width: int, height: int):
+        """Background half of handle_image_content (runs on the executor)"""
         try:
-            # Use content manager for optimized storage
+            # Exact dedup before any encoding: re-copying the same image
+            # used to PNG-encode it just to discard the result
+            if self._seen(self._raw_image_hash(image)):
+                return
+
+            # Perceptual dedup before any encoding: byte-exact hashing
+            # treats a screenshot with a blinking cursor as new content,
+            # piling up near-identical multi-MB entries. Skip storage
+            # when the dHash is within Hamming distance 5 of a recent one.
+            phash = self._dhash(image)
+            if any(
+                bin(phash ^ recent).count("1") <= 5 for recent in self._recent_phashes
+            ):
+                logger.debug("Skipping near-duplicate image (perceptual hash)")
+                return
+            self._recent_phashes.append(phash)
+
+            # Use content manager for optimized storage (QImage variant
+            # is safe off the GUI thread)
             image_path, thumbnail_path, image_data, thumbnail_data = (
-                self.content_manager.store_image(pixmap)
+                self.content_manager.store_image_from_qimage(image)
             )
 
             if not image_path:
                 logger.error("Failed to store image")
                 return
 
-            # Generate content hash for deduplication
-            import hashlib
-
-            content_hash = hashlib.sha256(image_data).hexdigest()[:16]
-
-            if content_hash == self.last_content_hash:
-                return
-
-            # Offload DB write to background thread (file I/O already done above)
-            def _worker():
-                try:
-                    item_id = self.database.add_image_item(
-                        image_data=image_data,
-                        thumbnail_data=thumbnail_data,
-                        width=pixmap.width(),
-                        height=pixmap.height(),
-                        image_format="PNG",
-                        metadata={
-                            "source": "clipboard_watch",
-                            "original_size": len(image_data),
-                        },
-                    )
-                    if item_id > 0:
-                        self.last_content_hash = content_hash
-                        item_data = {
-                            "id": item_id,
-                            "content_type": "image",
-                            "file_path": image_path,
-                            "thumbnail_path": thumbnail_path,
-                            "width": pixmap.width(),
-                            "height": pixmap.height(),
-                            "preview": thumbnail_path,
-                        }
-                        self.content_changed.emit("image", item_data)
-                        logger.debug(
-                            f"Added image item {item_id} ({pixmap.width()}x{pixmap.height()})"
-                        )
-                except Exception as e:
-                    logger.error(f"DB worker error (image): {e}")
-
-            self._executor.submit(_worker)
-
+            item_id = self.database.add_image_item(
+                image_data=image_data,
+                thumbnail_data=thumbnail_data,
+                width=width,
+                height=height,
+                image_format="PNG",
+                metadata={
+                    "source": "clipboard_watch",
+                    "original_size": len(image_data),
+                },
+            )
+            if item_id > 0:
+                item_data = {
+                    "id": item_id,
+                    "content_type": "image",
+                    "file_path": image_path,
+                    "thumbnail_path": thumbnail_path,
+                    "width": width,
+                    "height": height,
+                    "preview": thumbnail_path,
+                }
+                # Cross-thread emit is safe: Qt queues it to receivers
+                # living on the GUI thread
+                self.content_changed.emit("image", item_data)
+                logger.debug(f"Added image item {item_id} ({width}x{height})")
         except Exception as e:
             logger.error(f"Error handling image content: {e}")
 
@@ -291,19 +495,19 @@ class ClipboardWatcher(QObject):
         mime_types: list,
     ):
         """Handle content with multiple formats like Windows Clipboard"""
+        # primary_content is str for text/html, bytes for rtf; strip()
+        # and len() work on both
         if not primary_content or not primary_content.strip():
             return
 
         # Generate content hash for deduplication
-        combined = f"{primary_format}:{primary_content}"
-        content_hash = hashlib.sha256(combined.encode()).hexdigest()[:16]
+        content_hash = _hash_key(primary_format, primary_content)
 
-        if content_hash == self.last_content_hash:
+        if self._seen(content_hash):
             return
 
         # Skip very large content
-        max_length = self.config.get("max_text_length", 1000000)
-        if len(primary_content) > max_length:
+        if len(primary_content) > self._max_text_length:
             logger.warning(
                 f"Content too large ({len(primary_content)} chars), skipping"
             )
@@ -327,26 +531,29 @@ class ClipboardWatcher(QObject):
         # Offload DB write to background thread
         def _worker():
             try:
+                # Decode RTF bytes lazily, only now that the payload has
+                # passed every dedup and size gate
+                content = (
+                    primary_content.decode("utf-8", errors="ignore")
+                    if isinstance(primary_content, bytes)
+                    else primary_content
+                )
                 item_id = self.database.add_multi_format_text_item(
-                    content=primary_content,
+                    content=content,
                     html_content=html_content,
                     format_type=primary_format,
                     metadata=metadata,
+                    content_hash=content_hash,
                 )
                 if item_id > 0:
-                    self.last_content_hash = content_hash
                     item_data = {
                         "id": item_id,
                         "content_type": "text",
-                        "content": primary_content,
+                        "content": content,
                         "html_content": html_content,
                         "format": primary_format,
                         "original_mime_types": mime_types,
-                        "preview": (
-                            primary_content[:150] + "..."
-                            if len(primary_content) > 150
-                            else primary_content
-                        ),
+                        "preview": _preview(content),
                     }
                     self.content_changed.emit("text", item_data)
                     logger.debug(
@@ -359,5 +566,8 @@ class ClipboardWatcher(QObject):
 
     def update_config(self):
         """Update configuration settings"""
-        # Reload any cached config values
-        pass
+        # Reload cached hot-path config values
+        self._max_text_length = int(self.config.get("max_text_length", 1000000))
+        self._debounce_ms = max(
+            50, min(250, int(self.config.get("clipboard_signal_debounce_ms", 120)))
+        )
@@ -6,15 +6,17 @@
 """
 Intelligent content management for clipboard items
 """
+import contextlib
 import hashlib
 import json
 import logging
+import os
 from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Tuple
 
-from PySide6.QtCore import QBuffer, QByteArray, QIODevice
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImage, QPixmap
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +79,51 @@ class ContentManager:
             logger.error(f"Error storing image: {e}")
             return "", "", b"", b""
 
+    def store_image_from_qimage(
+        self, image: QImage, format: str = "PNG", quality: int = 95
+    ) -> Tuple[str, str, bytes, bytes]:
+        """
+        Store a QImage - worker-thread-safe variant of store_image.
+
+        QImage can be scaled and encoded off the GUI thread while QPixmap
+        cannot, so background workers use this entry point.
+        Returns: (image_path, thumbnail_path, image_data, thumbnail_data)
+        """
+        try:
+            image_data = self._image_to_bytes(image, format, quality)
+            content_hash = hashlib.sha256(image_data).hexdigest()[:16]
+
+            # Generate file paths
+            image_filename = f"{content_hash}.{format.lower()}"
+            thumbnail_filename = f"{content_hash}_thumb.{format.lower()}"
+
+            image_path = self.images_dir / image_filename
+            thumbnail_path = self.thumbnails_dir / thumbnail_filename
+
+            # Create optimized thumbnail (128x128 max)
+            thumbnail_image = image.scaled(
+                128,
+                128,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            thumbnail_data = self._image_to_bytes(thumbnail_image, format, 85)
+
+            # Save files if they don't exist
+            if not image_path.exists():
+                with open(image_path, "wb") as f:
+                    f.write(image_data)
+
+            if not thumbnail_path.exists():
+                with open(thumbnail_path, "wb") as f:
+                    f.write(thumbnail_data)
+
+            return str(image_path), str(thumbnail_path), image_data, thumbnail_data
+
+        except Exception as e:
+            logger.error(f"Error storing image: {e}")
+            return "", "", b"", b""
+
     def load_image(self, image_path: str) -> Optional[QPixmap]:
         """Load image with caching"""
         try:
@@ -151,18 +198,19 @@ class ContentManager:
     def cleanup_orphaned_files(self, active_file_paths: set):
         """Remove files not referenced in database"""
         try:
-            cleaned_count = 0
-
-            # Check images directory
-            for image_file in self.images_dir.iterdir():
-                if str(image_file) not in active_file_paths:
-                    image_file.unlink()
-                    cleaned_count += 1
+            # Collect victims first with scandir (string paths, no Path
+            # allocation per entry), then unlink the whole batch
+            orphans = [
+                entry.path
+                for directory in (self.images_dir, self.thumbnails_dir)
+                for entry in os.scandir(directory)
+                if entry.path not in active_file_paths
+            ]
 
-            # Check thumbnails directory
-            for thumb_file in self.thumbnails_dir.iterdir():
-                if str(thumb_file) not in active_file_paths:
-                    thumb_file.unlink()
+            cleaned_count = 0
+            for path in orphans:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
                     cleaned_count += 1
 
             if cleaned_count > 0:
@@ -201,6 +249,33 @@ class ContentManager:
             logger.error(f"Error converting pixmap to bytes: {e}")
             return b""
 
+    def _image_to_bytes(self, image: QImage, format: str, quality: int) -> bytes:
+        """Convert QImage to bytes - safe to call from worker threads"""
+        try:
+            byte_array = QByteArray()
+            buffer = QBuffer(byte_array)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+
+            if format.upper() == "JPEG" and image.hasAlphaChannel():
+                # Composite ARGB over white (QPainter on QImage is
+                # allowed outside the GUI thread, unlike on QPixmap)
+                from PySide6.QtGui import QColor, QPainter
+
+                rgb_image = QImage(image.size(), QImage.Format.Format_RGB32)
+                rgb_image.fill(QColor("white"))
+                painter = QPainter(rgb_image)
+                painter.drawImage(0, 0, image)
+                painter.end()
+                rgb_image.save(buffer, format, quality)
+            else:
+                image.save(buffer, format, quality)
+
+            buffer.close()
+            return byte_array.data()
+        except Exception as e:
+            logger.error(f"Error converting image to bytes: {e}")
+            return b""
+
     def _create_optimized_thumbnail(
         self, pixmap: QPixmap, max_size: int = 128
     ) -> QPixmap:
@@ -13,7 +13,7 @@ import logging
 import sqlite3
 import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from appdirs import user_data_dir
 
@@ -55,10 +55,16 @@ class ClipboardDatabase:
     def compute_text_hash(self, content: str, format_type: str) -> str:
         """Compute stable text hash combining format and content.
 
-        Using the same logic everywhere prevents inconsistent deduplication.
+        Using the same logic everywhere prevents inconsistent
+        deduplication: this is the same blake2b format:content scheme
+        the clipboard watcher uses for the keys it forwards, so rows
+        dedup identically whether the caller or the DB hashes them.
         """
-        combined = f"{format_type}:{content}"
-        return hashlib.sha256(combined.encode()).hexdigest()[:16]
+        h = hashlib.blake2b(digest_size=8)
+        h.update(format_type.encode())
+        h.update(b":")
+        h.update(content.encode())
+        return h.hexdigest()
 
     # Internal helper for serialized transactions
     from contextlib import contextmanager
@@ -113,8 +119,18 @@ class ClipboardDatabase:
         combined = f"{content_type}:{content}"
         return hashlib.sha256(combined.encode()).hexdigest()[:16]
 
-    def add_text_item(self, content: str, metadata: Optional[dict] = None) -> int:
-        """Add text item with proper MIME type handling"""
+    def add_text_item(
+        self,
+        content: str,
+        metadata: Optional[dict] = None,
+        content_hash: Optional[str] = None,
+    ) -> int:
+        """Add text item with proper MIME type handling.
+
+        content_hash lets callers that already hashed the payload for
+        their own deduplication forward the key, skipping a second full
+        pass over the content here.
+        """
         if self.connection is None:
             logger.error("Database connection not initialized")
             return -1
@@ -136,8 +152,9 @@ class ClipboardDatabase:
             # Determine format for hashing
             format_type = metadata.get("format", "plain") if metadata else "plain"
 
-            # Generate content hash (stable across code paths)
-            content_hash = self.compute_text_hash(content, format_type)
+            # Generate content hash unless the caller already did
+            if content_hash is None:
+                content_hash = self.compute_text_hash(content, format_type)
 
             # Check for existing item
             existing_id = self._get_existing_item_id(content_hash)
@@ -223,15 +240,21 @@ class ClipboardDatabase:
         html_content: Optional[str] = None,
         format_type: str = "plain",
         metadata: Optional[dict] = None,
+        content_hash: Optional[str] = None,
     ) -> int:
-        """Add text item with multiple formats (Windows-like behavior)"""
+        """Add text item with multiple formats (Windows-like behavior).
+
+        content_hash works as in add_text_item: a caller-provided dedup
+        key skips the internal re-hash of the content.
+        """
         if self.connection is None:
             logger.error("Database connection not initialized")
             return -1
 
         try:
-            # Generate content hash using stable method
-            content_hash = self.compute_text_hash(content, format_type)
+            # Generate content hash unless the caller already did
+            if content_hash is None:
+                content_hash = self.compute_text_hash(content, format_type)
 
             # Check for existing item
             existing_id = self._get_existing_item_id(content_hash)
@@ -448,6 +471,39 @@ class ClipboardDatabase:
             logger.error(f"Failed to get items: {e}")
             return []
 
+    def get_active_file_paths(self) -> Set[str]:
+        """Get all referenced image/thumbnail paths as a set.
+
+        Projects just the two path columns instead of hydrating full item
+        dicts - the maintenance passes only need the paths.
+
+        Raises on failure instead of returning an empty set: callers
+        feed the result to cleanup_orphaned_files, which would read an
+        empty set as "nothing is referenced" and delete every stored
+        image, so a broken query must abort the cleanup pass.
+        """
+        if self.connection is None:
+            raise RuntimeError("Database connection not initialized")
+
+        with self._lock:
+            cursor = self.connection.cursor()
+            # Stream in batches rather than materializing every row;
+            # no LIMIT - a capped scan would let cleanup delete files
+            # still referenced by items beyond the cap
+            cursor.arraysize = 500
+            cursor.execute(
+                """
+                SELECT file_path, thumbnail_path FROM image_content
+                WHERE file_path IS NOT NULL OR thumbnail_path IS NOT NULL
+            """
+            )
+            active: Set[str] = set()
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return active
+                active.update(path for row in rows for path in row if path)
+
     def search_items(self, query: str, limit: int = 25) -> List[Dict]:
         """Advanced search with multiple strategies"""
         if not query:
@@ -1,4 +1,27 @@
 # clipboard_manager/src/ui/__init__.py
 """
 User interface components for B1Clip
+
+Submodules are imported lazily (PEP 562) so that `from ui import X`
+convenience access does not pull every widget module - and its PySide6
+dependencies - into the startup import graph.
 """
+import importlib
+
+_LAZY = {
+    "PopupWindow": ("ui.popup_window", "PopupWindow"),
+    "SettingsWindow": ("ui.settings_window", "SettingsWindow"),
+    "SystemTray": ("ui.system_tray", "SystemTray"),
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
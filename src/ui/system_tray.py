@@ -22,7 +22,9 @@ class SystemTray(QObject):
     def __init__(self, popup_window, settings_window):
         super().__init__()
         self.popup_window = popup_window
-        self.settings_window = settings_window
+        # Either the window itself or a zero-arg callable returning it
+        # (lets the application construct the settings window lazily)
+        self._settings_window = settings_window
 
         # Create icon and menu before showing
         self.tray_icon = QSystemTrayIcon()
@@ -200,6 +202,12 @@ class SystemTray(QObject):
             500, lambda: self.tray_icon.setIcon(self.create_modern_icon(active=False))
         )
 
+    @property
+    def settings_window(self):
+        if callable(self._settings_window):
+            return self._settings_window()
+        return self._settings_window
+
     def show_settings(self):
         """Show settings window with presentation"""
         self.settings_window.show()
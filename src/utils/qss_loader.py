@@ -29,6 +29,11 @@ class QSSLoader:
 
         self.styles_dir.mkdir(parents=True, exist_ok=True)
 
+        # Combined-stylesheet cache keyed by (filename, mtime) pairs so
+        # an unchanged bundle skips both the disk reads and the Qt
+        # stylesheet re-parse; editing a file invalidates automatically
+        self._bundle_cache: dict[tuple, str] = {}
+
     def load_stylesheet(self, filename: str) -> str:
         """Load QSS stylesheet from file"""
         file_path = self.styles_dir / filename
@@ -46,8 +51,24 @@ class QSSLoader:
             logger.error(f"Error loading QSS file {file_path}: {e}")
             return ""
 
+    def _bundle_key(self, filenames: list[str]) -> tuple:
+        """Cache key for a bundle: each file name with its mtime."""
+        key = []
+        for fn in filenames:
+            try:
+                mtime = (self.styles_dir / fn).stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            key.append((fn, mtime))
+        return tuple(key)
+
     def load_stylesheets(self, filenames: list[str]) -> str:
-        """Load and concatenate multiple QSS files."""
+        """Load and concatenate multiple QSS files (cached by mtime)."""
+        key = self._bundle_key(filenames)
+        cached = self._bundle_cache.get(key)
+        if cached is not None:
+            return cached
+
         contents: list[str] = []
         missing: list[str] = []
         for fn in filenames:
@@ -58,7 +79,12 @@ class QSSLoader:
                 missing.append(fn)
         if missing:
             logger.warning(f"Missing QSS files: {missing}")
-        return "\n".join(contents)
+
+        combined = "\n".join(contents)
+        if len(self._bundle_cache) >= 16:
+            self._bundle_cache.clear()
+        self._bundle_cache[key] = combined
+        return combined
 
     def apply_stylesheet(self, widget, filename: str):
         """Apply QSS stylesheet to widget"""
@@ -87,7 +113,9 @@ class QSSLoader:
         css = self.load_stylesheets(filenames)
         if css:
             app = cast(Optional[QApplication], QApplication.instance())
-            if app is not None:
+            if app is not None and css != app.styleSheet():
+                # setStyleSheet triggers a full re-polish; skip when the
+                # effective stylesheet is already identical
                 app.setStyleSheet(css)
 
     def get_available_stylesheets(self) -> list: